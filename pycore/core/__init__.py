@@ -15,7 +15,7 @@ from pycore.core.exceptions import (
 )
 from pycore.core.schema import Result
 from pycore.core.config import ConfigManager, BaseSettings, ConfigLoader, TomlConfigLoader
-from pycore.core.logger import Logger, LogLevel, LoggerConfig, get_logger
+from pycore.core.logger import Logger, LogLevel, LoggerConfig, get_bound_logger, get_logger
 
 __all__ = [
     # Exceptions
@@ -37,4 +37,5 @@ __all__ = [
     "LogLevel",
     "LoggerConfig",
     "get_logger",
+    "get_bound_logger",
 ]
@@ -0,0 +1,37 @@
+"""
+JSON 编解码工具。
+
+优先使用 orjson，未安装时回退到标准库。
+"""
+
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    序列化为紧凑的 JSON 字符串（非 ASCII 字符原样保留，未知类型转为字符串）。
+
+    含 orjson 不支持的输入（如非字符串键）时回退到标准库。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """解析 JSON 字符串或字节串。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -15,11 +15,50 @@ import os
 import sys
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
 from loguru import logger as loguru_logger
 
+# 控制台时间格式（毫秒部分单独拼接）
+_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
+# 预先渲染的 ANSI 转义码，与 loguru 默认级别颜色一致
+_RESET = "\x1b[0m"
+_GREEN = "\x1b[32m"
+_CYAN = "\x1b[36m"
+_LEVEL_COLORS = {
+    "TRACE": "\x1b[36m\x1b[1m",
+    "DEBUG": "\x1b[34m\x1b[1m",
+    "INFO": "\x1b[1m",
+    "SUCCESS": "\x1b[32m\x1b[1m",
+    "WARNING": "\x1b[33m\x1b[1m",
+    "ERROR": "\x1b[31m\x1b[1m",
+    "CRITICAL": "\x1b[41m\x1b[1m",
+}
+
+
+def _console_sink(message: Any) -> None:
+    """
+    彩色控制台输出。
+
+    直接拼接预先渲染的 ANSI 码，绕过 loguru 的颜色标签解析。
+    loguru 以 "{message}" 格式传入，已着色的异常堆栈附加在文本末尾。
+    """
+    record = message.record
+    text = record["message"]
+    level = record["level"].name
+    color = _LEVEL_COLORS.get(level, "")
+    time = record["time"]
+    sys.stderr.write(
+        f"{_GREEN}{time.strftime(_TIME_FMT)}.{time.microsecond // 1000:03d}{_RESET} | "
+        f"{color}{level: <8}{_RESET} | "
+        f"{_CYAN}{record['name']}{_RESET}:{_CYAN}{record['function']}{_RESET}:"
+        f"{_CYAN}{record['line']}{_RESET} | "
+        f"{color}{text}{_RESET}{str(message)[len(text):]}"
+    )
+
 
 class LogLevel(str, Enum):
     """日志级别。"""
@@ -47,6 +86,7 @@ class LoggerConfig:
         retention: str = "30 days",
         compression: str = "zip",
         app_name: str = "pycore",
+        enqueue: bool = True,
     ):
         self.level = level
         self.log_dir = Path(log_dir) if log_dir else Path("logs")
@@ -57,6 +97,8 @@ class LoggerConfig:
         self.retention = retention
         self.compression = compression
         self.app_name = app_name
+        # 在后台线程中格式化和写入，调用方只承担入队开销
+        self.enqueue = enqueue
 
 
 class Logger:
@@ -98,26 +140,25 @@ class Logger:
         is_production = env_mode in ("PROD", "PRODUCTION")
         use_json = is_production or self._config.json_format
 
-        # 控制台格式
-        if use_json:
-            console_format = "{message}"
-        else:
-            console_format = (
-                "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-                "<level>{level: <8}</level> | "
-                "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-                "<level>{message}</level>"
-            )
-
         # 添加控制台处理器
         if self._config.console_enabled:
-            self._logger.add(
-                sys.stderr,
-                level=self._config.level.value,
-                format=console_format,
-                serialize=use_json,
-                colorize=not use_json,
-            )
+            if use_json:
+                self._logger.add(
+                    sys.stderr,
+                    level=self._config.level.value,
+                    format="{message}",
+                    serialize=True,
+                    enqueue=self._config.enqueue,
+                )
+            else:
+                self._logger.add(
+                    _console_sink,
+                    level=self._config.level.value,
+                    format="{message}",
+                    # 格式中没有颜色标签，colorize 只作用于异常堆栈（保留彩色和 diagnose 高亮）
+                    colorize=True,
+                    enqueue=self._config.enqueue,
+                )
 
         # 添加文件处理器
         if self._config.file_enabled:
@@ -134,6 +175,7 @@ class Logger:
                 compression=self._config.compression,
                 serialize=True,  # 文件始终使用 JSON
                 encoding="utf-8",
+                enqueue=self._config.enqueue,
             )
 
         self._configured = True
@@ -157,6 +199,8 @@ class Logger:
     def reset(cls) -> None:
         """重置日志器实例（用于测试）。"""
         if cls._instance:
+            # 等待队列中的日志写完再移除处理器
+            cls._instance._logger.complete()
             cls._instance._logger.remove()
         cls._instance = None
 
@@ -206,6 +250,17 @@ class Logger:
             return f"{message} | {extra}"
         return message
 
+    def __copy__(self) -> "Logger":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "Logger":
+        """
+        日志器是共享的门面，复制持有它的对象时直接复用。
+
+        启用 enqueue 时处理器持有的进程间队列不可复制。
+        """
+        return self
+
     def bind(self, **kwargs: Any) -> "Logger":
         """创建带上下文的绑定日志器。"""
         bound = Logger.__new__(Logger)
@@ -244,3 +299,16 @@ def get_logger() -> Logger:
 def configure_logging(config: Optional[LoggerConfig] = None) -> Logger:
     """配置全局日志器。"""
     return Logger.configure(config)
+
+
+@lru_cache(maxsize=256)
+def get_bound_logger(key: str, value: str) -> Logger:
+    """
+    获取绑定了单个上下文字段的日志器（按字段缓存）。
+
+    用于按名称创建大量实例的类（如服务、流程），避免每次实例化都重新 bind。
+
+    用法：
+        logger = get_bound_logger("service", "user_service")
+    """
+    return get_logger().bind(**{key: value})
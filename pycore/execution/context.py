@@ -9,7 +9,8 @@ from __future__ import annotations
 
 from contextlib import asynccontextmanager, contextmanager
 from contextvars import ContextVar, Token
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 # 用于执行作用域数据的上下文变量
 _execution_context: ContextVar[dict[str, Any]] = ContextVar(
@@ -41,8 +42,18 @@ class ExecutionContext:
     """
 
     @classmethod
-    def current(cls) -> dict[str, Any]:
-        """获取当前上下文字典。"""
+    def current(cls) -> Mapping[str, Any]:
+        """
+        获取当前上下文的只读视图。
+
+        写操作总是替换整个字典（写时复制），因此无需复制即可安全返回。
+        读取单个键请优先使用 get()。
+        """
+        return MappingProxyType(_execution_context.get())
+
+    @classmethod
+    def snapshot(cls) -> dict[str, Any]:
+        """获取当前上下文字典的可修改副本。"""
         return _execution_context.get().copy()
 
     @classmethod
@@ -142,6 +153,6 @@ class ExecutionContext:
 
 
 # 便捷函数
-def execution_context() -> dict[str, Any]:
+def execution_context() -> Mapping[str, Any]:
     """获取当前执行上下文。"""
     return ExecutionContext.current()
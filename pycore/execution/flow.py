@@ -14,7 +14,7 @@ from typing import Any, Callable, Optional, Union
 from pydantic import BaseModel, Field
 
 from pycore.core.exceptions import ExecutionError
-from pycore.core.logger import get_logger
+from pycore.core.logger import get_bound_logger
 
 
 class FlowStep(BaseModel):
@@ -42,7 +42,7 @@ class FlowStep(BaseModel):
         arbitrary_types_allowed = True
 
 
-class FlowResult(BaseModel):
+class FlowResult:
     """
     流程执行结果。
 
@@ -53,42 +53,67 @@ class FlowResult(BaseModel):
             print(result.error)
     """
 
-    success: bool = True
-    data: Any = None
-    error: Optional[str] = None
-    step_results: dict[str, Any] = Field(default_factory=dict)
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    __slots__ = ("success", "data", "error", "step_results", "metadata")
 
-    class Config:
-        arbitrary_types_allowed = True
+    def __init__(
+        self,
+        success: bool = True,
+        data: Any = None,
+        error: Optional[str] = None,
+        step_results: Optional[dict[str, Any]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        self.success = success
+        self.data = data
+        self.error = error
+        self.step_results = step_results if step_results is not None else {}
+        self.metadata = metadata if metadata is not None else {}
 
     def __bool__(self) -> bool:
         return self.success
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlowResult):
+            return NotImplemented
+        return (
+            self.success == other.success
+            and self.data == other.data
+            and self.error == other.error
+            and self.step_results == other.step_results
+            and self.metadata == other.metadata
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"FlowResult(success={self.success!r}, data={self.data!r}, "
+            f"error={self.error!r}, step_results={self.step_results!r}, "
+            f"metadata={self.metadata!r})"
+        )
+
     @property
     def output(self) -> Any:
         """向后兼容：output -> data"""
         return self.data
 
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典以便序列化。"""
+        return {
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+            "step_results": self.step_results,
+            "metadata": self.metadata,
+        }
+
     @classmethod
     def ok(cls, data: Any, step_results: Optional[dict] = None, **metadata) -> "FlowResult":
         """创建成功结果。"""
-        return cls(
-            success=True,
-            data=data,
-            step_results=step_results or {},
-            metadata=metadata,
-        )
+        return cls(True, data, None, step_results, metadata)
 
     @classmethod
     def fail(cls, error: str, step_results: Optional[dict] = None, **metadata) -> "FlowResult":
         """创建失败结果。"""
-        return cls(
-            success=False,
-            error=error,
-            step_results=step_results or {},
-            metadata=metadata,
-        )
+        return cls(False, None, error, step_results, metadata)
 
 
 class BaseFlow(BaseModel, ABC):
@@ -120,7 +145,7 @@ class BaseFlow(BaseModel, ABC):
 
     def __init__(self, **data):
         super().__init__(**data)
-        self._logger = get_logger().bind(flow=self.name)
+        self._logger = get_bound_logger("flow", self.name)
 
     async def run(self, input_data: Any) -> FlowResult:
         """
@@ -243,6 +268,9 @@ class ParallelFlow(BaseFlow):
 
     所有步骤接收相同的输入并并发运行。
 
+    默认快速失败：首个步骤失败时立即取消其余步骤。
+    设置 fail_fast=False 则等待全部步骤完成并汇总所有错误。
+
     用法：
         flow = ParallelFlow(name="parallel_tasks")
         flow.add_step("task1", process_task1)
@@ -255,6 +283,9 @@ class ParallelFlow(BaseFlow):
     max_concurrency: Optional[int] = Field(
         None, description="Maximum concurrent tasks"
     )
+    fail_fast: bool = Field(
+        default=True, description="首个步骤失败时取消其余步骤"
+    )
 
     async def execute(self, input_data: Any) -> FlowResult:
         if not self.steps:
@@ -263,42 +294,54 @@ class ParallelFlow(BaseFlow):
         step_results: dict[str, Any] = {}
         errors: list[str] = []
 
-        # 创建任务
-        tasks = []
+        # 检查处理器
+        runnable: list[FlowStep] = []
         for step in self.steps:
             handler = step.handler
             if isinstance(handler, str):
                 errors.append(f"String handlers not supported: {handler}")
                 continue
+            runnable.append(step)
 
-            task = self._execute_step(step, input_data)
-            tasks.append((step.name, task))
-
-        # 使用可选并发限制执行
-        if self.max_concurrency:
-            semaphore = asyncio.Semaphore(self.max_concurrency)
+        if errors and self.fail_fast:
+            return FlowResult.fail(
+                f"Parallel execution errors: {'; '.join(errors)}",
+                step_results=step_results,
+            )
 
-            async def limited_task(name: str, coro):
-                async with semaphore:
-                    return name, await coro
+        # 创建任务（可选并发限制）
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        tasks = {
+            asyncio.ensure_future(self._execute_step(step, input_data, semaphore)): step.name
+            for step in runnable
+        }
 
-            results = await asyncio.gather(
-                *[limited_task(name, task) for name, task in tasks],
-                return_exceptions=True,
-            )
-        else:
-            results = await asyncio.gather(
-                *[self._wrap_task(name, task) for name, task in tasks],
-                return_exceptions=True,
-            )
+        return_when = (
+            asyncio.FIRST_EXCEPTION if self.fail_fast else asyncio.ALL_COMPLETED
+        )
+        try:
+            if tasks:
+                await asyncio.wait(list(tasks), return_when=return_when)
+        finally:
+            # 快速失败或 execute() 本身被取消（如外层 wait_for 超时）时，
+            # 取消所有未完成的步骤并等待其结束
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
         # 处理结果
-        for result in results:
-            if isinstance(result, Exception):
-                errors.append(str(result))
+        for task, name in tasks.items():
+            if task.cancelled():
+                continue
+            exc = task.exception()
+            if exc is not None:
+                errors.append(str(exc))
             else:
-                name, output = result
-                step_results[name] = output
+                step_results[name] = task.result()
 
         if errors:
             return FlowResult.fail(
@@ -308,13 +351,17 @@ class ParallelFlow(BaseFlow):
 
         return FlowResult.ok(step_results, step_results=step_results)
 
-    async def _wrap_task(self, name: str, coro) -> tuple[str, Any]:
-        """用名称包装任务以便结果映射。"""
-        result = await coro
-        return name, result
-
-    async def _execute_step(self, step: FlowStep, input_data: Any) -> Any:
+    async def _execute_step(
+        self,
+        step: FlowStep,
+        input_data: Any,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Any:
         """执行单个步骤。"""
+        if semaphore is not None:
+            async with semaphore:
+                return await self._execute_step(step, input_data)
+
         handler = step.handler
         config = step.config
 
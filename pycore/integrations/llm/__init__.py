@@ -7,6 +7,9 @@ Provides unified interface for multiple LLM providers.
 
 from __future__ import annotations
 
+from types import MappingProxyType
+from typing import Mapping
+
 from pycore.integrations.llm.base import (
     LLMProvider,
     LLMConfig,
@@ -14,6 +17,7 @@ from pycore.integrations.llm.base import (
     Message,
     ToolCall,
     ToolDefinition,
+    stable_prefix,
 )
 from pycore.integrations.llm.openai_provider import OpenAIProvider
 from pycore.integrations.llm.token_counter import TokenCounter, estimate_tokens
@@ -26,6 +30,7 @@ __all__ = [
     "Message",
     "ToolCall",
     "ToolDefinition",
+    "stable_prefix",
     # Providers
     "OpenAIProvider",
     # Utilities
@@ -34,6 +39,16 @@ __all__ = [
 ]
 
 
+# 提供商类型到实现类的映射（只读）
+_PROVIDERS: Mapping[str, type[LLMProvider]] = MappingProxyType(
+    {
+        "openai": OpenAIProvider,
+        "azure": OpenAIProvider,  # Uses same class with different config
+        "ollama": OpenAIProvider,  # Uses same class with different base_url
+    }
+)
+
+
 def create_provider(
     provider_type: str = "openai",
     **kwargs,
@@ -52,13 +67,8 @@ def create_provider(
         provider = create_provider("openai", api_key="sk-...")
         response = await provider.chat([Message(role="user", content="Hello")])
     """
-    providers = {
-        "openai": OpenAIProvider,
-        "azure": OpenAIProvider,  # Uses same class with different config
-        "ollama": OpenAIProvider,  # Uses same class with different base_url
-    }
-
-    if provider_type not in providers:
-        raise ValueError(f"Unknown provider: {provider_type}. Available: {list(providers.keys())}")
+    provider_cls = _PROVIDERS.get(provider_type)
+    if provider_cls is None:
+        raise ValueError(f"Unknown provider: {provider_type}. Available: {list(_PROVIDERS)}")
 
-    return providers[provider_type](**kwargs)
+    return provider_cls(**kwargs)
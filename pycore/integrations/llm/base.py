@@ -8,12 +8,15 @@ LLM 提供商的基础类和接口。
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import Any, AsyncIterator, Optional, Union
 
 from pydantic import BaseModel, Field
 
 from pycore.core.exceptions import LLMError
+from pycore.core.jsonutil import json_dumps, json_loads
 
 
 class MessageRole(str, Enum):
@@ -25,7 +28,8 @@ class MessageRole(str, Enum):
     TOOL = "tool"
 
 
-class Message(BaseModel):
+@dataclass
+class Message:
     """
     LLM 消息模型。
 
@@ -35,14 +39,14 @@ class Message(BaseModel):
         msg = Message.system("You are a helpful assistant.")
     """
 
-    role: str = Field(..., description="消息角色")
-    content: Optional[str] = Field(None, description="消息内容")
-    name: Optional[str] = Field(None, description="工具/函数名称")
-    tool_call_id: Optional[str] = Field(None, description="工具响应的工具调用 ID")
-    tool_calls: Optional[list["ToolCall"]] = Field(None, description="来自助手的工具调用")
+    role: str  # 消息角色
+    content: Optional[str] = None  # 消息内容
+    name: Optional[str] = None  # 工具/函数名称
+    tool_call_id: Optional[str] = None  # 工具响应的工具调用 ID
+    tool_calls: Optional[list[ToolCall]] = None  # 来自助手的工具调用
 
     def to_dict(self) -> dict[str, Any]:
-        """转换为字典以供 API 调用。"""
+        """转换为字典以供 API 调用，跳过值为 None 的 content 和空的可选字段。"""
         d = {"role": self.role}
         if self.content is not None:
             d["content"] = self.content
@@ -74,13 +78,19 @@ class Message(BaseModel):
         """创建工具响应消息。"""
         return cls(role="tool", content=content, tool_call_id=tool_call_id, name=name)
 
+    @classmethod
+    def tool_json(cls, content: Any, tool_call_id: str, name: str = None) -> "Message":
+        """创建工具响应消息，将结构化结果序列化为 JSON 内容。"""
+        return cls.tool(json_dumps(content), tool_call_id, name)
+
 
-class ToolCall(BaseModel):
+@dataclass
+class ToolCall:
     """来自 LLM 响应的工具调用。"""
 
-    id: str = Field(..., description="工具调用 ID")
-    type: str = Field(default="function", description="工具类型")
-    function: dict[str, Any] = Field(..., description="函数名称和参数")
+    id: str  # 工具调用 ID
+    function: dict[str, Any]  # 函数名称和参数
+    type: str = "function"  # 工具类型
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -99,8 +109,14 @@ class ToolCall(BaseModel):
         """获取函数参数（JSON 字符串）。"""
         return self.function.get("arguments", "{}")
 
+    @cached_property
+    def parsed_arguments(self) -> dict[str, Any]:
+        """获取解析后的函数参数（首次访问时解析并缓存）。"""
+        return json_loads(self.function.get("arguments") or "{}")
+
 
-class ToolDefinition(BaseModel):
+@dataclass
+class ToolDefinition:
     """
     LLM 的工具定义。
 
@@ -118,26 +134,43 @@ class ToolDefinition(BaseModel):
         )
     """
 
-    name: str = Field(..., description="工具名称")
-    description: str = Field(..., description="工具描述")
-    parameters: dict[str, Any] = Field(
-        default_factory=lambda: {"type": "object", "properties": {}},
-        description="参数的 JSON Schema",
+    name: str  # 工具名称
+    description: str  # 工具描述
+    parameters: dict[str, Any] = field(
+        default_factory=lambda: {"type": "object", "properties": {}}
+    )  # 参数的 JSON Schema
+
+    # to_dict() 的缓存结果，字段变更时失效
+    _cached_dict: Optional[dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
     )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name != "_cached_dict":
+            object.__setattr__(self, "_cached_dict", None)
+        object.__setattr__(self, name, value)
+
     def to_dict(self) -> dict[str, Any]:
-        """转换为 OpenAI 函数格式。"""
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters,
-            },
-        }
+        """
+        转换为 OpenAI 函数格式。
 
+        工具定义通常注册一次并在多次请求中复用，结果会被缓存；
+        返回的字典为共享对象，请勿修改。
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": self.parameters,
+                },
+            }
+        return self._cached_dict
 
-class LLMResponse(BaseModel):
+
+@dataclass
+class LLMResponse:
     """
     LLM 响应模型。
 
@@ -149,18 +182,19 @@ class LLMResponse(BaseModel):
             print(response.content)
     """
 
-    content: Optional[str] = Field(None, description="响应内容")
-    tool_calls: list[ToolCall] = Field(default_factory=list, description="工具调用")
-    model: str = Field(default="", description="使用的模型")
-    finish_reason: str = Field(default="stop", description="完成原因")
+    content: Optional[str] = None  # 响应内容
+    tool_calls: list[ToolCall] = field(default_factory=list)  # 工具调用
+    model: str = ""  # 使用的模型
+    finish_reason: str = "stop"  # 完成原因
 
     # 使用统计
-    prompt_tokens: int = Field(default=0)
-    completion_tokens: int = Field(default=0)
-    total_tokens: int = Field(default=0)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0  # 命中提示缓存的输入 token 数
 
     # 原始响应
-    raw: Optional[dict] = Field(None, description="原始 API 响应")
+    raw: Optional[dict] = None  # 原始 API 响应
 
     @property
     def has_tool_calls(self) -> bool:
@@ -175,6 +209,19 @@ class LLMResponse(BaseModel):
         )
 
 
+def stable_prefix(messages: list[Message]) -> list[Message]:
+    """
+    将系统消息稳定地排到最前面，其余消息保持原有顺序。
+
+    提示缓存按请求前缀匹配，固定的系统提示词（连同工具定义）在前、
+    变化的对话在后，才能在多轮请求间命中缓存。
+    """
+    system = [m for m in messages if m.role == "system"]
+    if not system:
+        return list(messages)
+    return system + [m for m in messages if m.role != "system"]
+
+
 class LLMConfig(BaseModel):
     """
     LLM 提供商配置。
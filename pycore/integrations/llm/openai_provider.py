@@ -8,10 +8,13 @@ OpenAI 兼容的 LLM 提供商。
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Any, AsyncIterator, Optional
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Optional, TypedDict
+from weakref import WeakKeyDictionary
 
 from pycore.core.exceptions import LLMError, TokenLimitError
+from pycore.core.jsonutil import json_loads
 from pycore.core.logger import get_logger
 from pycore.integrations.llm.base import (
     LLMConfig,
@@ -21,28 +24,164 @@ from pycore.integrations.llm.base import (
     ToolCall,
     ToolDefinition,
 )
+from pycore.integrations.llm.token_counter import estimate_tokens
 
-# 尝试导入 OpenAI
-try:
-    from openai import AsyncOpenAI, APIError, RateLimitError, APITimeoutError
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    AsyncOpenAI = None
-
-# 尝试导入 tenacity 用于重试
-try:
-    from tenacity import (
-        retry,
-        stop_after_attempt,
-        wait_exponential,
-        retry_if_exception_type,
+
+# 提示缓存生效的最小前缀 token 数（OpenAI）
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# openai 和 tenacity 导入开销较大，仅探测是否安装，首次使用时再导入
+OPENAI_AVAILABLE = find_spec("openai") is not None
+TENACITY_AVAILABLE = find_spec("tenacity") is not None
+
+# 延迟导入后可作为本模块属性访问的 openai 名称
+_OPENAI_NAMES = frozenset(
+    {"AsyncOpenAI", "APIError", "APITimeoutError", "BadRequestError", "RateLimitError"}
+)
+
+
+class ChatParams(TypedDict, total=False):
+    """chat.completions.create 的请求参数。"""
+
+    model: str
+    messages: list[dict[str, Any]]
+    temperature: float
+    top_p: float
+    frequency_penalty: float
+    presence_penalty: float
+    max_tokens: int
+    tools: list[dict[str, Any]]
+    tool_choice: Any
+    stream: bool
+    stop: Any
+    seed: int
+    response_format: dict[str, Any]
+    logprobs: bool
+    extra_body: dict[str, Any]
+
+
+@lru_cache(maxsize=None)
+def _openai():
+    """首次使用时导入 openai 模块。"""
+    import openai
+
+    return openai
+
+
+def __getattr__(name: str) -> Any:
+    """延迟解析 openai 导出的名称，并缓存到模块全局变量中。"""
+    if name in _OPENAI_NAMES:
+        value = getattr(_openai(), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# 按事件循环分组、再按 (base_url, api_key, timeout) 共享的客户端及其引用计数。
+# httpx 连接绑定创建它的事件循环，不能跨循环复用
+_CLIENTS: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, Any]] = (
+    WeakKeyDictionary()
+)
+_CLIENT_REFS: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, int]] = (
+    WeakKeyDictionary()
+)
+# 每个事件循环的关闭钩子（见 _pool_finalizer），持有强引用以免被提前回收
+_FINALIZERS: WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = WeakKeyDictionary()
+
+
+async def _pool_finalizer(loop: asyncio.AbstractEventLoop):
+    """
+    事件循环关闭时关闭其池中剩余的客户端。
+
+    以异步生成器的形式注册到事件循环：asyncio.run() 在关闭循环前调用
+    loop.shutdown_asyncgens()，会对它执行 aclose()，从而运行 finally 中的清理。
+    """
+    try:
+        yield
+    finally:
+        # 生成器经由其 finalizer 钩子强引用 loop，结束时移除全部条目以便回收
+        _FINALIZERS.pop(loop, None)
+        _CLIENT_REFS.pop(loop, None)
+        clients = _CLIENTS.pop(loop, None) or {}
+        await asyncio.gather(
+            *(c.close() for c in clients.values()), return_exceptions=True
+        )
+
+
+def _loop_pool(
+    loop: asyncio.AbstractEventLoop,
+) -> tuple[dict[tuple, Any], dict[tuple, int]]:
+    """获取事件循环对应的客户端池，并丢弃已关闭循环遗留的条目。"""
+    for closed in [lp for lp in _CLIENTS if lp.is_closed()]:
+        _CLIENTS.pop(closed, None)
+        _CLIENT_REFS.pop(closed, None)
+        _FINALIZERS.pop(closed, None)
+    clients = _CLIENTS.get(loop)
+    if clients is None:
+        clients = _CLIENTS[loop] = {}
+        _CLIENT_REFS[loop] = {}
+        # 在当前循环中启动生成器，使其登记到 loop 的异步生成器集合；
+        # 首步只执行到 yield，无需等待，可同步驱动
+        finalizer = _pool_finalizer(loop)
+        try:
+            finalizer.asend(None).send(None)
+        except StopIteration:
+            pass
+        _FINALIZERS[loop] = finalizer
+    return clients, _CLIENT_REFS[loop]
+
+
+def _release_client(loop: asyncio.AbstractEventLoop, key: tuple, client: Any) -> bool:
+    """释放一次对共享客户端的引用，返回是否为最后一个使用者。"""
+    clients = _CLIENTS.get(loop)
+    refs = _CLIENT_REFS.get(loop)
+    if clients is None or refs is None:
+        return True
+    count = refs.get(key, 1) - 1
+    if count > 0:
+        refs[key] = count
+        return False
+    refs.pop(key, None)
+    if clients.get(key) is client:
+        del clients[key]
+    return True
+
+
+def _http_client():
+    """
+    创建共享客户端使用的 HTTP 客户端。
+
+    基于 SDK 的默认客户端（保留 follow_redirects 等默认设置），
+    多个提供商共享同一连接池，因此把保持活动的连接数提高到 SDK 默认值之上。
+    旧版 SDK 没有 DefaultAsyncHttpxClient 时返回 None，由 SDK 自行创建。
+    """
+    import httpx
+
+    client_cls = getattr(_openai(), "DefaultAsyncHttpxClient", None)
+    if client_cls is None:
+        return None
+    return client_cls(
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200)
     )
 
-    TENACITY_AVAILABLE = True
-except ImportError:
-    TENACITY_AVAILABLE = False
+
+@lru_cache(maxsize=None)
+def _error_kinds() -> tuple[tuple[type, str], ...]:
+    """异常类型到错误类别的映射，按顺序匹配。"""
+    openai = _openai()
+    return (
+        (openai.RateLimitError, "rate"),
+        (openai.APITimeoutError, "timeout"),
+        (openai.BadRequestError, "bad_request"),
+    )
+
+
+def _classify_error(error: Exception) -> Optional[str]:
+    """按异常类型对 API 错误分类，未知错误返回 None。"""
+    for exc_type, kind in _error_kinds():
+        if isinstance(error, exc_type):
+            return kind
+    return None
 
 
 class OpenAIProvider(LLMProvider):
@@ -90,18 +229,54 @@ class OpenAIProvider(LLMProvider):
         super().__init__(config, **kwargs)
         self._logger = get_logger()
         self._client: Optional[AsyncOpenAI] = None
+        self._client_key: Optional[tuple] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
     def client(self) -> AsyncOpenAI:
-        """获取或创建 OpenAI 客户端。"""
-        if self._client is None:
-            self._client = AsyncOpenAI(
-                api_key=self.config.api_key,
-                base_url=self.config.base_url,
-                timeout=self.config.timeout,
-                max_retries=0,  # 我们自己处理重试
-            )
-        return self._client
+        """
+        获取或创建 OpenAI 客户端。
+
+        同一事件循环内，相同 (base_url, api_key, timeout) 的提供商共享同一个客户端，
+        从而复用 HTTP 连接池，避免重复的 TCP/TLS 握手。
+        在事件循环之外访问时创建不共享的客户端。
+        """
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if self._client is not None and self._client_loop is loop:
+            return self._client
+
+        # 客户端属于另一个事件循环（如先后多次 asyncio.run），放弃它并重新获取
+        if self._client is not None and self._client_key is not None:
+            _release_client(self._client_loop, self._client_key, self._client)
+
+        if loop is None:
+            key = None
+            client = self._create_client()
+        else:
+            key = (self.config.base_url, self.config.api_key, self.config.timeout)
+            clients, refs = _loop_pool(loop)
+            client = clients.get(key)
+            if client is None:
+                client = clients[key] = self._create_client()
+            refs[key] = refs.get(key, 0) + 1
+        self._client = client
+        self._client_key = key
+        self._client_loop = loop
+        return client
+
+    def _create_client(self) -> AsyncOpenAI:
+        """创建新的 OpenAI 客户端。"""
+        return _openai().AsyncOpenAI(
+            api_key=self.config.api_key,
+            base_url=self.config.base_url,
+            timeout=self.config.timeout,
+            max_retries=0,  # 我们自己处理重试
+            http_client=_http_client(),
+        )
 
     async def chat(
         self,
@@ -115,7 +290,8 @@ class OpenAIProvider(LLMProvider):
         参数：
             messages: 消息列表
             tools: 可选的工具列表
-            **kwargs: 额外选项（temperature、max_tokens 等）
+            **kwargs: 额外选项（temperature、max_tokens、cache_key、tools_payload 等）；
+                keep_raw=True 时在 LLMResponse.raw 中保留原始响应体
 
         返回：
             LLM 响应
@@ -130,14 +306,20 @@ class OpenAIProvider(LLMProvider):
         # 使用重试逻辑执行
         for attempt in range(self.config.max_retries + 1):
             try:
-                response = await self.client.chat.completions.create(**params)
-                return self._parse_response(response)
+                # 读取原始响应体自行解析，跳过 SDK 构建 Pydantic 模型
+                response = await self.client.chat.completions.with_raw_response.create(
+                    **params
+                )
+                return self._parse_response(
+                    json_loads(response.content),
+                    keep_raw=kwargs.get("keep_raw", False),
+                )
 
             except Exception as e:
-                error_type = type(e).__name__
+                kind = _classify_error(e)
 
-                # 检查速率限制
-                if "rate" in str(e).lower() or "429" in str(e):
+                # 速率限制：指数退避重试
+                if kind == "rate":
                     if attempt < self.config.max_retries:
                         delay = self.config.retry_delay * (2**attempt)
                         self._logger.warning(
@@ -147,25 +329,22 @@ class OpenAIProvider(LLMProvider):
                         await asyncio.sleep(delay)
                         continue
 
-                # 检查 token 限制
-                if "token" in str(e).lower() and "limit" in str(e).lower():
-                    raise TokenLimitError(
-                        str(e),
-                        model=self.config.model,
-                    )
-
-                # 检查超时
-                if "timeout" in str(e).lower():
+                # 超时：固定延迟重试
+                elif kind == "timeout":
                     if attempt < self.config.max_retries:
                         self._logger.warning(
-                            f"Timeout, retrying...",
+                            "Timeout, retrying...",
                             attempt=attempt + 1,
                         )
                         await asyncio.sleep(self.config.retry_delay)
                         continue
 
+                # 超出上下文长度
+                elif kind == "bad_request" and getattr(e, "code", None) == "context_length_exceeded":
+                    raise TokenLimitError(str(e))
+
                 # 其他错误
-                self._logger.error(f"LLM error: {error_type}: {e}")
+                self._logger.error(f"LLM error: {type(e).__name__}: {e}")
                 raise LLMError(
                     str(e),
                     provider="openai",
@@ -216,13 +395,13 @@ class OpenAIProvider(LLMProvider):
         messages: list[Message],
         tools: Optional[list[ToolDefinition]] = None,
         **kwargs,
-    ) -> dict[str, Any]:
+    ) -> ChatParams:
         """构建 API 请求参数。"""
         # 将消息转换为字典格式
         message_dicts = [m.to_dict() for m in messages]
 
         # 基础参数
-        params = {
+        params: ChatParams = {
             "model": kwargs.get("model", self.config.model),
             "messages": message_dicts,
             "temperature": kwargs.get("temperature", self.config.temperature),
@@ -236,9 +415,12 @@ class OpenAIProvider(LLMProvider):
         if max_tokens:
             params["max_tokens"] = max_tokens
 
-        # 工具
-        if tools:
-            params["tools"] = [t.to_dict() for t in tools]
+        # 工具：多轮对话中工具不变时，可传入预先序列化的 tools_payload 复用
+        tools_payload = kwargs.get("tools_payload")
+        if tools_payload is None and tools:
+            tools_payload = [t.to_dict() for t in tools]
+        if tools_payload:
+            params["tools"] = tools_payload
             params["tool_choice"] = kwargs.get("tool_choice", "auto")
 
         # 流式传输
@@ -250,41 +432,63 @@ class OpenAIProvider(LLMProvider):
             if key in kwargs:
                 params[key] = kwargs[key]
 
+        # 提示缓存键：相同键的请求会被路由到同一缓存
+        cache_key = kwargs.get("cache_key")
+        if cache_key:
+            params["extra_body"] = {"prompt_cache_key": cache_key}
+            prefix_tokens = sum(
+                estimate_tokens(m.content or "") for m in messages if m.role == "system"
+            )
+            if prefix_tokens < PROMPT_CACHE_MIN_TOKENS:
+                self._logger.debug(
+                    "System prompt below prompt cache threshold",
+                    estimated_tokens=prefix_tokens,
+                    min_tokens=PROMPT_CACHE_MIN_TOKENS,
+                )
+
         return params
 
-    def _parse_response(self, response) -> LLMResponse:
-        """解析 OpenAI API 响应。"""
-        choice = response.choices[0]
-        message = choice.message
+    def _parse_response(self, body: dict[str, Any], keep_raw: bool = False) -> LLMResponse:
+        """
+        解析 OpenAI API 响应体（已解码的 JSON 字典）。
 
-        # 解析工具调用（如果存在）
-        tool_calls = []
-        if message.tool_calls:
-            for tc in message.tool_calls:
-                tool_calls.append(
-                    ToolCall(
-                        id=tc.id,
-                        type=tc.type,
-                        function={
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    )
-                )
+        大多数调用方不使用原始响应，仅在 keep_raw 时保留，避免长期持有整个响应体。
+        """
+        choice = body["choices"][0]
+        message = choice["message"]
 
+        # 解析工具调用（如果存在）
+        # function 字段已是 {"name", "arguments"} 字典，直接复用
+        tool_calls = [
+            ToolCall(tc["id"], tc["function"], tc.get("type") or "function")
+            for tc in message.get("tool_calls") or ()
+        ]
+
+        usage = body.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
         return LLMResponse(
-            content=message.content,
+            content=message.get("content"),
             tool_calls=tool_calls,
-            model=response.model,
-            finish_reason=choice.finish_reason or "stop",
-            prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
-            completion_tokens=response.usage.completion_tokens if response.usage else 0,
-            total_tokens=response.usage.total_tokens if response.usage else 0,
-            raw=response.model_dump() if hasattr(response, "model_dump") else None,
+            model=body.get("model", ""),
+            finish_reason=choice.get("finish_reason") or "stop",
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+            total_tokens=usage.get("total_tokens") or 0,
+            cached_tokens=details.get("cached_tokens") or 0,
+            raw=body if keep_raw else None,
         )
 
     async def close(self):
-        """关闭客户端连接。"""
+        """
+        释放客户端。
+
+        客户端为共享对象，最后一个使用者释放时才真正关闭连接池；
+        未释放的客户端在事件循环经 asyncio.run() 关闭时统一关闭。
+        """
         if self._client:
-            await self._client.close()
+            key = self._client_key
+            if key is None or _release_client(self._client_loop, key, self._client):
+                await self._client.close()
             self._client = None
+            self._client_key = None
+            self._client_loop = None
@@ -7,17 +7,32 @@ LLM 提供商的 token 计数工具。
 
 from __future__ import annotations
 
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import Optional, Union
 
 from pycore.integrations.llm.base import Message
 
-# 尝试导入 tiktoken
-try:
+# tiktoken 导入开销较大（Rust 扩展），仅探测是否安装，首次使用时再导入
+TIKTOKEN_AVAILABLE = find_spec("tiktoken") is not None
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    """获取 tiktoken 编码（按名称缓存）。"""
     import tiktoken
 
-    TIKTOKEN_AVAILABLE = True
-except ImportError:
-    TIKTOKEN_AVAILABLE = False
+    return tiktoken.get_encoding(encoding_name)
+
+
+@lru_cache(maxsize=1024)
+def _encode_len(encoding_name: str, text: str) -> int:
+    """
+    计算文本的 token 数（LRU 缓存）。
+
+    对话中系统提示词和工具描述会在每轮重复计数，缓存可避免重复分词。
+    """
+    return len(_get_encoding(encoding_name).encode(text))
 
 
 class TokenCounter:
@@ -60,30 +75,45 @@ class TokenCounter:
     def __init__(self, model: str = "gpt-4"):
         self.model = model
         self._encoding = None
+        self._encode = None  # 预先绑定的 encode 方法
+        self._tokens_per_message = self._tokens_per_message_for(model)
 
         if TIKTOKEN_AVAILABLE:
             self._init_encoding()
 
-    def _init_encoding(self):
-        """初始化 tiktoken 编码。"""
-        # 尝试精确模型匹配
-        encoding_name = self.MODEL_ENCODINGS.get(self.model)
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _encoding_name_for(cls, model: str) -> str:
+        """解析模型对应的编码名称（精确匹配优先，其次前缀匹配）。"""
+        encoding_name = cls.MODEL_ENCODINGS.get(model)
+        if encoding_name:
+            return encoding_name
 
-        # 尝试前缀匹配
-        if not encoding_name:
-            for prefix, enc in self.MODEL_ENCODINGS.items():
-                if self.model.startswith(prefix):
-                    encoding_name = enc
-                    break
+        for prefix, enc in cls.MODEL_ENCODINGS.items():
+            if model.startswith(prefix):
+                return enc
 
         # 默认为 cl100k_base
-        if not encoding_name:
-            encoding_name = "cl100k_base"
+        return "cl100k_base"
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _tokens_per_message_for(cls, model: str) -> int:
+        """解析模型每条消息的 token 开销。"""
+        for prefix, overhead in cls.TOKENS_PER_MESSAGE.items():
+            if model.startswith(prefix):
+                return overhead
+        return 3  # 默认
+
+    def _init_encoding(self):
+        """初始化 tiktoken 编码。"""
+        encoding_name = self._encoding_name_for(self.model)
 
         try:
-            self._encoding = tiktoken.get_encoding(encoding_name)
+            self._encoding = _get_encoding(encoding_name)
         except Exception:
-            self._encoding = tiktoken.get_encoding("cl100k_base")
+            self._encoding = _get_encoding("cl100k_base")
+        self._encode = self._encoding.encode
 
     def count_text(self, text: str) -> int:
         """
@@ -99,7 +129,7 @@ class TokenCounter:
             return 0
 
         if self._encoding:
-            return len(self._encoding.encode(text))
+            return _encode_len(self._encoding.name, text)
 
         # 回退估算：英文约 4 个字符 per token
         return len(text) // 4
@@ -114,27 +144,21 @@ class TokenCounter:
         返回：
             包括开销的 token 数量
         """
-        tokens = 0
+        count_text = self.count_text
 
         # 消息开销
-        tokens_per_message = 3  # 默认
-        for prefix, overhead in self.TOKENS_PER_MESSAGE.items():
-            if self.model.startswith(prefix):
-                tokens_per_message = overhead
-                break
-
-        tokens += tokens_per_message
+        tokens = self._tokens_per_message
 
         # 角色
-        tokens += self.count_text(message.role)
+        tokens += count_text(message.role)
 
         # 内容
         if message.content:
-            tokens += self.count_text(message.content)
+            tokens += count_text(message.content)
 
         # 名称
         if message.name:
-            tokens += self.count_text(message.name)
+            tokens += count_text(message.name)
             tokens += 1  # 名称开销
 
         return tokens
@@ -149,8 +173,31 @@ class TokenCounter:
         返回：
             总 token 数量
         """
-        total = sum(self.count_message(m) for m in messages)
-        total += 3  # 回复启动 token
+        # 收集所有文本，避免逐条调用 count_message
+        texts: list[str] = []
+        append = texts.append
+        names = 0
+        for m in messages:
+            append(m.role)
+            if m.content:
+                append(m.content)
+            if m.name:
+                append(m.name)
+                names += 1
+
+        # 消息开销 + 名称开销 + 回复启动 token
+        total = len(messages) * self._tokens_per_message + names + 3
+
+        encoding = self._encoding
+        if encoding:
+            # 逐条走 LRU 缓存：多轮对话中历史消息的计数可直接复用
+            name = encoding.name
+            for text in texts:
+                total += _encode_len(name, text)
+        else:
+            # 回退估算：英文约 4 个字符 per token
+            for text in texts:
+                total += len(text) // 4
         return total
 
     def truncate_text(self, text: str, max_tokens: int) -> str:
@@ -164,15 +211,16 @@ class TokenCounter:
         返回：
             截断后的文本
         """
-        if self.count_text(text) <= max_tokens:
-            return text
-
-        if self._encoding:
-            tokens = self._encoding.encode(text)
+        if self._encode:
+            # 只编码一次：长度足够时直接返回原文
+            tokens = self._encode(text)
             if len(tokens) <= max_tokens:
                 return text
             return self._encoding.decode(tokens[:max_tokens])
 
+        if len(text) // 4 <= max_tokens:
+            return text
+
         # 回退：估算字符数
         estimated_chars = max_tokens * 4
         return text[:estimated_chars]
@@ -198,11 +246,44 @@ class TokenCounter:
         return used_tokens + completion_tokens <= context_limit
 
 
+def _build_byte_classes() -> bytes:
+    """
+    构建 UTF-8 字节分类表，用于 bytes.translate。
+
+    0: 续字节（不计数）
+    1: ASCII
+    2/3/4: 2/3/4 字节序列的首字节（每个字符恰好一个）
+    """
+    table = bytearray(256)
+    for b in range(256):
+        if b < 0x80:
+            table[b] = 1
+        elif b < 0xC0:
+            table[b] = 0
+        elif b < 0xE0:
+            table[b] = 2
+        elif b < 0xF0:
+            table[b] = 3
+        else:
+            table[b] = 4
+    return bytes(table)
+
+
+_BYTE_CLASSES = _build_byte_classes()
+
+# 各类字符的每字符 token 权重
+_ASCII_WEIGHT = 1 / 4  # 英文约 4 个字符 per token
+_TWO_BYTE_WEIGHT = 1 / 1.5  # 拉丁扩展、西里尔等
+_THREE_BYTE_WEIGHT = 1 / 1.5  # 中文/日文约 1-2 个字符 per token
+_FOUR_BYTE_WEIGHT = 1.0  # emoji 等补充平面字符
+
+
 def estimate_tokens(text: str) -> int:
     """
     快速 token 估算，无需模型特定计数。
 
-    使用简单启发式：英文文本约 4 个字符 per token。
+    按字符类别加权：ASCII 约 4 个字符 per token，CJK 约 1.5 个字符 per token，
+    emoji 等 4 字节字符约 1 个 token。
 
     参数：
         text: 输入文本
@@ -213,16 +294,17 @@ def estimate_tokens(text: str) -> int:
     if not text:
         return 0
 
-    # 针对不同字符类型调整
-    # ASCII 约 4 个字符 per token
-    # 中文/日文约 1-2 个字符 per token
-    ascii_chars = sum(1 for c in text if ord(c) < 128)
-    non_ascii_chars = len(text) - ascii_chars
-
-    ascii_tokens = ascii_chars / 4
-    non_ascii_tokens = non_ascii_chars / 1.5  # CJK 字符使用更多 token
+    if text.isascii():
+        return int(len(text) * _ASCII_WEIGHT)
 
-    return int(ascii_tokens + non_ascii_tokens)
+    # 用 translate 将 UTF-8 字节映射为类别（C 层单次遍历），再按类别计数
+    classes = text.encode("utf-8").translate(_BYTE_CLASSES)
+    return int(
+        classes.count(1) * _ASCII_WEIGHT
+        + classes.count(2) * _TWO_BYTE_WEIGHT
+        + classes.count(3) * _THREE_BYTE_WEIGHT
+        + classes.count(4) * _FOUR_BYTE_WEIGHT
+    )
 
 
 # 模型上下文限制
@@ -242,6 +324,7 @@ CONTEXT_LIMITS = {
 }
 
 
+@lru_cache(maxsize=64)
 def get_context_limit(model: str) -> int:
     """
     获取模型的上下文限制。
@@ -8,16 +8,40 @@ PyCore 插件的基础类。
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Any, ClassVar, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from pycore.core.exceptions import PluginError
+from pycore.core.jsonutil import json_dumps
 
 
-class PluginResult(BaseModel):
+class _SuccessField:
+    """
+    PluginResult.success 描述符。
+
+    实例上访问为 bool 字段；在类上访问为向后兼容的 success() 工厂方法。
+    """
+
+    def __get__(self, obj: Optional["PluginResult"], cls: type) -> Any:
+        if obj is None:
+            return cls.ok
+        return obj._success
+
+    def __set__(self, obj: "PluginResult", value: bool) -> None:
+        obj._success = value
+
+
+class PluginResult:
     """
     插件执行的标准结果。
 
@@ -36,15 +60,48 @@ class PluginResult(BaseModel):
             print(result.data)
     """
 
-    success: bool = Field(default=True, description="是否成功")
-    data: Any = Field(default=None, description="插件输出数据")
-    error: Optional[str] = Field(default=None, description="失败时的错误消息")
-    metadata: dict[str, Any] = Field(
-        default_factory=dict, description="额外元数据"
-    )
+    __slots__ = ("_success", "data", "error", "_metadata")
 
-    class Config:
-        arbitrary_types_allowed = True
+    success = _SuccessField()
+
+    def __init__(
+        self,
+        success: bool = True,
+        data: Any = None,
+        error: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        self.success = success  # 是否成功
+        self.data = data  # 插件输出数据
+        self.error = error  # 失败时的错误消息
+        self._metadata = metadata or None  # 额外元数据，为空时不分配字典
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """额外元数据（首次访问时才分配字典）。"""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[dict[str, Any]]) -> None:
+        self._metadata = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PluginResult):
+            return NotImplemented
+        return (
+            self.success == other.success
+            and self.data == other.data
+            and self.error == other.error
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PluginResult(success={self.success!r}, data={self.data!r}, "
+            f"error={self.error!r}, metadata={self._metadata or {}!r})"
+        )
 
     def __bool__(self) -> bool:
         """基于 success 字段判断结果。"""
@@ -60,47 +117,152 @@ class PluginResult(BaseModel):
             return f"PluginResult(error={self.error})"
         if isinstance(self.data, str):
             return self.data
-        return json.dumps(self.data, indent=2, default=str)
+        return json_dumps(self.data)
+
+    def pretty(self) -> str:
+        """缩进格式的字符串表示，便于人工阅读。"""
+        if self.error or isinstance(self.data, str):
+            return str(self)
+        return json.dumps(self.data, indent=2, ensure_ascii=False, default=str)
 
     def __add__(self, other: "PluginResult") -> "PluginResult":
         """合并两个结果。"""
-        if self.error and other.error:
-            return PluginResult(success=False, error=f"{self.error}; {other.error}")
-        if self.error:
-            return self
-        if other.error:
-            return other
-
-        # 合并输出
-        if isinstance(self.data, str) and isinstance(other.data, str):
-            combined = f"{self.data}\n{other.data}"
-        elif isinstance(self.data, dict) and isinstance(other.data, dict):
-            combined = {**self.data, **other.data}
-        elif isinstance(self.data, list) and isinstance(other.data, list):
-            combined = self.data + other.data
-        else:
-            combined = [self.data, other.data]
-
-        return PluginResult(
-            success=True,
-            data=combined,
-            metadata={**self.metadata, **other.metadata},
-        )
+        return PluginResult.merge([self, other])
 
     @classmethod
-    def ok(cls, data: Any, **metadata) -> "PluginResult":
-        """创建成功结果。"""
-        return cls(success=True, data=data, metadata=metadata)
+    def merge(cls, results: list["PluginResult"]) -> "PluginResult":
+        """
+        一次性合并多个结果。
+
+        存在失败结果时返回失败（多个失败时合并错误消息）；
+        否则按数据类型合并：字符串按行拼接、字典合并（后者覆盖前者）、
+        列表拼接，其他情况收集为列表。
+
+        与 r1 + r2 + ... 逐对相加相比，只分配一次结果容器。
+        """
+        if not results:
+            return cls.ok(None)
+        if len(results) == 1:
+            return results[0]
+
+        errors = [r for r in results if r.error]
+        if len(errors) == 1:
+            return errors[0]
+        if errors:
+            return cls(False, None, "; ".join(r.error for r in errors))
+
+        items = [r.data for r in results]
+        combined: Any = items
+        # 以第一项确定类型，只检查一次
+        for kind in (str, dict, list):
+            if isinstance(items[0], kind):
+                if all(isinstance(d, kind) for d in items):
+                    if kind is str:
+                        combined = "\n".join(items)
+                    elif kind is dict:
+                        combined = {}
+                        for d in items:
+                            combined.update(d)
+                    else:
+                        combined = list(chain.from_iterable(items))
+                break
+
+        metadata: dict[str, Any] = {}
+        for r in results:
+            if r._metadata:
+                metadata.update(r._metadata)
+        return cls(True, combined, None, metadata)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典以便序列化。"""
+        return {
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+            "metadata": self._metadata or {},
+        }
 
     @classmethod
-    def success(cls, data: Any, **metadata) -> "PluginResult":
-        """创建成功结果。向后兼容 ok() 的别名。"""
-        return cls.ok(data, **metadata)
+    def ok(cls, data: Any, **metadata) -> "PluginResult":
+        """创建成功结果。"""
+        return cls(True, data, None, metadata)
 
     @classmethod
     def fail(cls, error: str, **metadata) -> "PluginResult":
         """创建失败结果。"""
-        return cls(success=False, error=error, metadata=metadata)
+        return cls(False, None, error, metadata)
+
+
+# 影响 to_spec() 输出的字段
+_SPEC_FIELDS = frozenset({"name", "description", "parameters"})
+
+# 未定义 parameters 时共享的空参数模式（只读，请勿修改）
+_EMPTY_PARAMS: dict[str, Any] = {"type": "object", "properties": {}, "required": []}
+
+
+@lru_cache(maxsize=None)
+def _plugin_pool() -> ThreadPoolExecutor:
+    """cpu_bound 插件共享的线程池（首次使用时创建）。"""
+    return ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pycore-plugin")
+
+
+class _WorkerCall:
+    """
+    在 cpu_bound 线程池中运行的一次插件调用。
+
+    协程在工作线程的独立事件循环中运行；cancel() 可从调用方线程协作式地取消它：
+    尚未开始时直接丢弃，运行中则在协程的下一个 await 处抛出 CancelledError。
+    不含 await 的阻塞代码无法被中断，工作线程会一直占用到其返回。
+    """
+
+    __slots__ = ("_coro", "_loop", "_task", "_cancelled", "_lock")
+
+    def __init__(self, coro: Any):
+        self._coro = coro
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def run(self) -> Any:
+        """在工作线程中执行。"""
+        loop = asyncio.new_event_loop()
+        try:
+            with self._lock:
+                if self._cancelled:
+                    raise asyncio.CancelledError()
+                self._loop = loop
+                self._task = loop.create_task(self._coro)
+            return loop.run_until_complete(self._task)
+        finally:
+            with self._lock:
+                self._loop = None
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def cancel(self) -> None:
+        """请求取消（线程安全）。"""
+        with self._lock:
+            self._cancelled = True
+            if self._task is None:
+                # 尚未开始：关闭协程，避免 "never awaited" 警告
+                self._coro.close()
+            elif self._loop is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+def _build_spec(
+    name: str, description: str, parameters: Optional[dict[str, Any]]
+) -> dict[str, Any]:
+    """构建 OpenAI 函数调用格式的规范字典。"""
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": parameters or _EMPTY_PARAMS,
+        },
+    }
 
 
 class BasePlugin(ABC, BaseModel):
@@ -130,17 +292,83 @@ class BasePlugin(ABC, BaseModel):
     parameters: Optional[dict[str, Any]] = Field(
         default=None, description="插件的参数模式"
     )
+    timeout: Optional[float] = Field(
+        default=None, description="批量执行时单次调用的超时（秒）"
+    )
+    cpu_bound: bool = Field(
+        default=False, description="是否在线程池中执行，避免阻塞事件循环"
+    )
+
+    # 类级规范：name/description/parameters 都有类默认值时在类定义时预先构建，
+    # 使用默认值的实例直接共享
+    _class_spec: ClassVar[Optional[dict[str, Any]]] = None
+    _class_spec_fields: ClassVar[Optional[tuple[Any, ...]]] = None
+
+    # 为 True 时 execute() 以单个位置参数接收参数字典：execute(self, payload)，
+    # 省去 **kwargs 的展开与重建
+    accepts_payload: ClassVar[bool] = False
+
+    # to_spec() 的缓存结果，相关字段变更时失效
+    _spec_cache: Optional[dict[str, Any]] = PrivateAttr(default=None)
+    # 注册了本插件的注册表，规范或启用状态变化时通知它们
+    _registries: weakref.WeakSet = PrivateAttr(default_factory=weakref.WeakSet)
 
     class Config:
         arbitrary_types_allowed = True
         extra = "allow"  # 允许子类添加字段
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._class_spec = None
+        cls._class_spec_fields = None
+        fields = cls.model_fields
+        if fields["name"].is_required() or fields["description"].is_required():
+            return
+        defaults = (
+            fields["name"].get_default(call_default_factory=True),
+            fields["description"].get_default(call_default_factory=True),
+            fields["parameters"].get_default(call_default_factory=True),
+        )
+        cls._class_spec_fields = defaults
+        cls._class_spec = _build_spec(*defaults)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _SPEC_FIELDS:
+            self._spec_cache = None
+        super().__setattr__(name, value)
+        if name in _SPEC_FIELDS or name == "enabled":
+            for registry in self._registries:
+                registry._invalidate_specs()
+
     async def __call__(self, **kwargs) -> PluginResult:
         """执行插件。"""
+        return await self.invoke(kwargs)
+
+    async def invoke(self, payload: dict[str, Any]) -> PluginResult:
+        """
+        以参数字典执行插件。
+
+        注册表直接传入已构建的字典，避免再经过一次 **kwargs 打包。
+        """
         if not self.enabled:
             return PluginResult.fail(f"Plugin '{self.name}' is disabled")
         try:
-            return await self.execute(**kwargs)
+            if self.accepts_payload:
+                coro = self.execute(payload)
+            else:
+                coro = self.execute(**payload)
+            if self.cpu_bound:
+                # 在工作线程的独立事件循环中运行，计算密集的插件不阻塞主循环；
+                # 调用方被取消（如 timeout）时把取消传递给工作线程中的协程
+                call = _WorkerCall(coro)
+                loop = asyncio.get_running_loop()
+                try:
+                    return await loop.run_in_executor(_plugin_pool(), call.run)
+                except asyncio.CancelledError:
+                    call.cancel()
+                    raise
+            return await coro
         except Exception as e:
             return PluginResult.fail(f"Plugin '{self.name}' failed: {e}")
 
@@ -157,17 +385,15 @@ class BasePlugin(ABC, BaseModel):
         """
         将插件转换为规范字典。
 
-        兼容 OpenAI 函数调用格式。
+        兼容 OpenAI 函数调用格式。结果会被缓存，返回的字典请勿修改。
         """
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters
-                or {"type": "object", "properties": {}, "required": []},
-            },
-        }
+        if self._spec_cache is None:
+            fields = (self.name, self.description, self.parameters)
+            if self._class_spec is not None and fields == self._class_spec_fields:
+                self._spec_cache = self._class_spec
+            else:
+                self._spec_cache = _build_spec(*fields)
+        return self._spec_cache
 
     async def setup(self) -> None:
         """
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import weakref
 from typing import Any, Optional
 
 from pycore.core.exceptions import PluginError, PluginNotFoundError
@@ -39,10 +41,19 @@ class PluginRegistry:
         await registry.cleanup()
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 16):
+        self.max_concurrency = max_concurrency  # execute_many 的最大并发数
         self._plugins: dict[str, BasePlugin] = {}
-        self._initialized: dict[str, bool] = {}
+        self._initialized: set[str] = set()  # 已执行 setup() 的插件名称
+        # 防止并发调用重复 setup()；锁与创建它的事件循环成对保存
+        self._init_locks: dict[
+            str, tuple[weakref.ReferenceType[asyncio.AbstractEventLoop], asyncio.Lock]
+        ] = {}
         self._logger = get_logger()
+        # 规范列表缓存，插件注册/注销或规范/启用状态变化时失效
+        self._all_specs: Optional[list[dict[str, Any]]] = None
+        self._enabled_specs: Optional[list[dict[str, Any]]] = None
+        self._enabled_names: Optional[list[str]] = None
 
     def register(self, plugin: BasePlugin) -> "PluginRegistry":
         """
@@ -64,14 +75,42 @@ class PluginRegistry:
                 operation="register",
             )
         self._plugins[plugin.name] = plugin
-        self._initialized[plugin.name] = False
+        plugin._registries.add(self)
+        self._invalidate_specs()
         self._logger.debug(f"Registered plugin: {plugin.name}")
         return self
 
     def register_all(self, *plugins: BasePlugin) -> "PluginRegistry":
-        """注册多个插件。"""
+        """
+        注册多个插件。
+
+        一次性检查重名并合并，任一插件重名时不注册任何插件。
+
+        抛出：
+            PluginError: 如果存在同名插件
+        """
+        new = {p.name: p for p in plugins}
+        duplicates = new.keys() & self._plugins.keys()
+        if len(new) != len(plugins):
+            # 参数中自身存在重名
+            seen: set[str] = set()
+            for plugin in plugins:
+                if plugin.name in seen:
+                    duplicates.add(plugin.name)
+                seen.add(plugin.name)
+        if duplicates:
+            names = ", ".join(sorted(duplicates))
+            raise PluginError(
+                f"Plugin(s) already registered: {names}",
+                plugin_name=names,
+                operation="register",
+            )
+
+        self._plugins.update(new)
         for plugin in plugins:
-            self.register(plugin)
+            plugin._registries.add(self)
+        self._invalidate_specs()
+        self._logger.debug(f"Registered {len(new)} plugins: {list(new)}")
         return self
 
     def unregister(self, name: str) -> "PluginRegistry":
@@ -85,8 +124,11 @@ class PluginRegistry:
             自身以支持链式调用
         """
         if name in self._plugins:
-            del self._plugins[name]
-            del self._initialized[name]
+            plugin = self._plugins.pop(name)
+            self._initialized.discard(name)
+            self._init_locks.pop(name, None)
+            plugin._registries.discard(self)
+            self._invalidate_specs()
             self._logger.debug(f"Unregistered plugin: {name}")
         return self
 
@@ -111,7 +153,9 @@ class PluginRegistry:
 
     def list_enabled(self) -> list[str]:
         """仅列出已启用的插件名称。"""
-        return [name for name, p in self._plugins.items() if p.enabled]
+        if self._enabled_names is None:
+            self._enabled_names = [name for name, p in self._plugins.items() if p.enabled]
+        return list(self._enabled_names)
 
     def to_specs(self, enabled_only: bool = True) -> list[dict[str, Any]]:
         """
@@ -125,10 +169,19 @@ class PluginRegistry:
         返回：
             插件规范列表
         """
-        plugins = self._plugins.values()
-        if enabled_only:
-            plugins = [p for p in plugins if p.enabled]
-        return [p.to_spec() for p in plugins]
+        if self._all_specs is None:
+            self._all_specs = [p.to_spec() for p in self._plugins.values()]
+            self._enabled_specs = [
+                p.to_spec() for p in self._plugins.values() if p.enabled
+            ]
+        specs = self._enabled_specs if enabled_only else self._all_specs
+        return list(specs)
+
+    def _invalidate_specs(self) -> None:
+        """使规范列表和已启用名称缓存失效，下次读取时重建。"""
+        self._all_specs = None
+        self._enabled_specs = None
+        self._enabled_names = None
 
     async def execute(
         self,
@@ -145,29 +198,51 @@ class PluginRegistry:
         返回：
             执行结果的 PluginResult
         """
+        return await self._execute(name, kwargs)
+
+    async def _execute(self, name: str, payload: dict[str, Any]) -> PluginResult:
+        """按名称以参数字典执行插件（execute 和 execute_many 共用）。"""
         plugin = self._plugins.get(name)
         if not plugin:
             return PluginResult.fail(f"Plugin '{name}' not found")
 
-        # 如需要则初始化
-        if not self._initialized.get(name):
-            try:
-                await plugin.setup()
-                self._initialized[name] = True
-                self._logger.debug(f"Initialized plugin: {name}")
-            except Exception as e:
-                return PluginResult.fail(f"Plugin '{name}' setup failed: {e}")
+        # 如需要则初始化（双重检查，同一插件的并发调用只执行一次 setup）
+        if name not in self._initialized:
+            async with self._init_lock(name):
+                if name not in self._initialized:
+                    try:
+                        await plugin.setup()
+                        self._initialized.add(name)
+                        self._logger.debug(f"Initialized plugin: {name}")
+                    except Exception as e:
+                        return PluginResult.fail(f"Plugin '{name}' setup failed: {e}")
 
         # 执行
-        self._logger.debug(f"Executing plugin: {name}", kwargs=kwargs)
-        return await plugin(**kwargs)
+        self._logger.debug(f"Executing plugin: {name}", kwargs=payload)
+        return await plugin.invoke(payload)
+
+    def _init_lock(self, name: str) -> asyncio.Lock:
+        """
+        获取插件在当前事件循环中的初始化锁。
+
+        Python 3.9 的 asyncio.Lock 绑定创建时的事件循环，跨循环使用会失败，
+        因此在事件循环变化时（如多次 asyncio.run）重新创建。
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._init_locks.get(name)
+        if entry is None or entry[0]() is not loop:
+            entry = self._init_locks[name] = (weakref.ref(loop), asyncio.Lock())
+        return entry[1]
 
     async def execute_many(
         self,
         calls: list[tuple[str, dict[str, Any]]],
     ) -> list[PluginResult]:
         """
-        执行多个插件。
+        并发执行多个插件。
+
+        调用之间相互独立，最多同时执行 max_concurrency 个；
+        插件设置了 timeout 时对单次调用限时，超时或异常转换为失败结果。
 
         参数：
             calls: (plugin_name, kwargs) 元组列表
@@ -175,22 +250,34 @@ class PluginRegistry:
         返回：
             相同顺序的 PluginResult 列表
         """
-        results = []
-        for name, kwargs in calls:
-            result = await self.execute(name, **kwargs)
-            results.append(result)
-        return results
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-    async def cleanup(self) -> None:
-        """清理所有已初始化的插件。"""
-        for name, plugin in self._plugins.items():
-            if self._initialized.get(name):
+        async def run(name: str, kwargs: dict[str, Any]) -> PluginResult:
+            plugin = self._plugins.get(name)
+            timeout = plugin.timeout if plugin else None
+            async with semaphore:
                 try:
-                    await plugin.teardown()
-                    self._initialized[name] = False
-                    self._logger.debug(f"Cleaned up plugin: {name}")
+                    return await asyncio.wait_for(self._execute(name, kwargs), timeout)
+                except asyncio.TimeoutError:
+                    return PluginResult.fail(f"Plugin '{name}' timed out after {timeout}s")
                 except Exception as e:
-                    self._logger.error(f"Plugin cleanup failed: {name}", error=str(e))
+                    return PluginResult.fail(f"Plugin '{name}' failed: {e}")
+
+        return list(await asyncio.gather(*(run(name, kwargs) for name, kwargs in calls)))
+
+    async def cleanup(self) -> None:
+        """并发清理所有已初始化的插件。"""
+        names = [name for name in self._plugins if name in self._initialized]
+        results = await asyncio.gather(
+            *(self._plugins[name].teardown() for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self._logger.error(f"Plugin cleanup failed: {name}", error=str(result))
+            else:
+                self._initialized.discard(name)
+                self._logger.debug(f"Cleaned up plugin: {name}")
 
     def __len__(self) -> int:
         return len(self._plugins)
@@ -8,17 +8,63 @@ AI Agent 专用服务类。
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import Any, Optional
+from io import StringIO
+from itertools import islice
+from typing import Any, Deque, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from pycore.core.exceptions import ServiceError, ServiceStateError
-from pycore.core.logger import get_logger
+from pycore.core.logger import get_bound_logger
 from pycore.core.schema import Message
 from pycore.services.state import ServiceState, StateMachine
 
 
+def _marks_dirty(name: str):
+    """包装 deque 的修改方法：调用前标记队列已被修改。"""
+    method = getattr(deque, name)
+
+    def wrapper(self, *args):
+        self.dirty = True
+        return method(self, *args)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+class _MessageDeque(deque):
+    """
+    记录修改的消息队列。
+
+    任何修改（追加、弹出、按下标替换等）都会置位 dirty，
+    AgentContext 据此判断派生缓存是否需要重建。
+    """
+
+    dirty = False
+
+
+for _name in (
+    "append",
+    "appendleft",
+    "extend",
+    "extendleft",
+    "insert",
+    "pop",
+    "popleft",
+    "remove",
+    "reverse",
+    "rotate",
+    "clear",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(_MessageDeque, _name, _marks_dirty(_name))
+
+
 class AgentContext(BaseModel):
     """
     AI Agent 的执行上下文。
@@ -32,13 +78,63 @@ class AgentContext(BaseModel):
         print(context.get("key"))
     """
 
-    messages: list[Message] = Field(default_factory=list)
+    messages: Deque[Message] = Field(default_factory=deque)
     metadata: dict[str, Any] = Field(default_factory=dict)
     max_messages: int = Field(default=100, description="保留的最大消息数")
 
+    # 与 messages 一一对应的 to_dict() 结果，随 add_message 增量维护；
+    # messages 在 add_message 之外被修改（dirty 置位）时整体重建
+    _dict_cache: Deque[dict[str, Any]] = PrivateAttr(default_factory=deque)
+
     class Config:
         arbitrary_types_allowed = True
 
+    def __init__(self, **data):
+        super().__init__(**data)
+        # 定长双端队列：超过 max_messages 时 append 自动丢弃最旧的消息
+        self.messages = self.messages
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # 替换消息或修改上限时按上限重建队列（保留最新的消息）
+        if name in ("messages", "max_messages"):
+            super().__setattr__(
+                "messages", _MessageDeque(self.messages, maxlen=self.max_messages)
+            )
+            self._rebuild_dict_cache()
+
+    @property
+    def duplicate_count(self) -> int:
+        """
+        末尾与最后一条消息内容相同的连续 assistant 消息数（不含最后一条本身）。
+
+        从队尾向前扫描，遇到第一条不同的消息即停止，只统计仍在窗口内的消息。
+        """
+        messages = self.messages
+        if len(messages) < 2:
+            return 0
+        last_content = messages[-1].content
+        if not last_content:
+            return 0
+        count = 0
+        for msg in islice(reversed(messages), 1, None):
+            if msg.role != "assistant" or msg.content != last_content:
+                break
+            count += 1
+        return count
+
+    def _sync_dict_cache(self) -> None:
+        """messages 在 add_message 之外被修改过时重建字典缓存。"""
+        if self.messages.dirty:
+            self._rebuild_dict_cache()
+
+    def _rebuild_dict_cache(self) -> None:
+        """按当前消息重建字典缓存。"""
+        self._dict_cache = deque(
+            (msg.to_dict() for msg in self.messages), maxlen=self.max_messages
+        )
+        self.messages.dirty = False
+
     def add_message(
         self,
         role: str,
@@ -46,21 +142,33 @@ class AgentContext(BaseModel):
         **kwargs,
     ) -> "AgentContext":
         """向上下文添加消息。"""
-        self.messages.append(Message(role=role, content=content, metadata=kwargs))
-        # 如果超过最大值则修剪
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
+        message = Message(role=role, content=content, metadata=kwargs)
+        self._sync_dict_cache()
+        self.messages.append(message)
+        # 两个队列上限相同，超出时同步丢弃最旧的一项
+        self._dict_cache.append(message.to_dict())
+        self.messages.dirty = False
         return self
 
     def get_messages(self, n: Optional[int] = None) -> list[Message]:
-        """获取最近的消息。"""
-        if n is None:
-            return self.messages.copy()
-        return self.messages[-n:]
+        """获取最近的消息（与切片 messages[-n:] 语义一致）。"""
+        if not n:
+            # None 或 0：全部消息（[-0:] 即整个列表）
+            return list(self.messages)
+        if n < 0:
+            # [-n:] 在 n 为负数时跳过最前面的 -n 条
+            return list(islice(self.messages, -n, None))
+        return list(islice(reversed(self.messages), n))[::-1]
 
     def get_messages_as_dicts(self) -> list[dict[str, Any]]:
-        """获取消息字典列表（用于 LLM 调用）。"""
-        return [msg.to_dict() for msg in self.messages]
+        """
+        获取消息字典列表（用于 LLM 调用）。
+
+        返回缓存的字典，请勿修改；对 messages 的直接增删改会自动触发重建，
+        但原地修改某条 Message 的字段不会被察觉。
+        """
+        self._sync_dict_cache()
+        return list(self._dict_cache)
 
     def set(self, key: str, value: Any) -> "AgentContext":
         """设置元数据值。"""
@@ -74,11 +182,13 @@ class AgentContext(BaseModel):
     def clear_messages(self) -> "AgentContext":
         """清除所有消息。"""
         self.messages.clear()
+        self._dict_cache.clear()
+        self.messages.dirty = False
         return self
 
     def clear(self) -> "AgentContext":
         """清除所有上下文。"""
-        self.messages.clear()
+        self.clear_messages()
         self.metadata.clear()
         return self
 
@@ -137,7 +247,7 @@ class AgentService(BaseModel, ABC):
     def __init__(self, **data):
         super().__init__(**data)
         self._state_machine = StateMachine(use_defaults=True)
-        self._logger = get_logger().bind(service=self.name)
+        self._logger = get_bound_logger("service", self.name)
 
     @property
     def state(self) -> ServiceState:
@@ -181,19 +291,21 @@ class AgentService(BaseModel, ABC):
         抛出：
             ServiceError: 如果服务无法启动
         """
-        if self.state != ServiceState.IDLE:
+        if self.state is not ServiceState.IDLE:
             raise ServiceStateError(
                 f"Cannot start service from state: {self.state}",
                 service_name=self.name,
-                from_state=self.state.value,
-                to_state=ServiceState.STARTING.value,
+                from_state=self._state_machine.state_name,
+                to_state=ServiceState.STARTING.label,
             )
 
         # 将输入添加到上下文
         if input_data:
             self.context.add_message("user", input_data)
 
-        results: list[str] = []
+        # 直接写入缓冲区，避免逐步构造 f-string 再整体 join
+        results = StringIO()
+        write = results.write
 
         try:
             # 启动阶段
@@ -206,7 +318,7 @@ class AgentService(BaseModel, ABC):
                 self._logger.info("Service running")
 
                 while self.current_step < self.max_steps:
-                    if self.state != ServiceState.RUNNING:
+                    if self.state is not ServiceState.RUNNING:
                         break
 
                     self.current_step += 1
@@ -216,7 +328,12 @@ class AgentService(BaseModel, ABC):
 
                     # 执行步骤
                     step_result = await self.step()
-                    results.append(f"Step {self.current_step}: {step_result}")
+                    if results.tell():
+                        write("\n")
+                    write("Step ")
+                    write(str(self.current_step))
+                    write(": ")
+                    write(str(step_result))
 
                     # 检查卡死状态
                     if self._is_stuck():
@@ -230,7 +347,9 @@ class AgentService(BaseModel, ABC):
 
                 if self.current_step >= self.max_steps:
                     self._logger.warning(f"Reached max steps: {self.max_steps}")
-                    results.append(f"Reached max steps ({self.max_steps})")
+                    if results.tell():
+                        write("\n")
+                    write(f"Reached max steps ({self.max_steps})")
 
             # 停止阶段
             async with self.state_context(ServiceState.STOPPING):
@@ -244,13 +363,13 @@ class AgentService(BaseModel, ABC):
         except Exception as e:
             self._logger.exception(f"Service error: {e}")
             await self.on_error(e)
-            raise ServiceError(str(e), service_name=self.name, state=self.state.value)
+            raise ServiceError(str(e), service_name=self.name, state=self._state_machine.state_name)
 
         finally:
             # 重置步数计数器
             self.current_step = 0
 
-        return "\n".join(results) if results else "No steps executed"
+        return results.getvalue() or "No steps executed"
 
     @abstractmethod
     async def step(self) -> str:
@@ -285,24 +404,12 @@ class AgentService(BaseModel, ABC):
         pass
 
     def _is_stuck(self) -> bool:
-        """检测服务是否处于卡死循环。"""
-        messages = self.context.messages
-        if len(messages) < 2:
-            return False
-
-        last_content = messages[-1].content
-        if not last_content:
-            return False
-
-        # 计算连续相同的消息数
-        count = 0
-        for msg in reversed(messages[:-1]):
-            if msg.role == "assistant" and msg.content == last_content:
-                count += 1
-            else:
-                break
+        """
+        检测服务是否处于卡死循环。
 
-        return count >= self.duplicate_threshold
+        只从队尾扫描连续重复的部分，无需遍历整个消息历史。
+        """
+        return self.context.duplicate_count >= self.duplicate_threshold
 
     def _handle_stuck(self) -> None:
         """通过添加上下文处理卡死状态。"""
@@ -319,7 +426,7 @@ class AgentService(BaseModel, ABC):
 
     def resume(self) -> None:
         """恢复服务执行。"""
-        if self.state == ServiceState.PAUSED:
+        if self.state is ServiceState.PAUSED:
             self._state_machine.transition(ServiceState.RUNNING)
             self._logger.info("Service resumed")
 
@@ -14,8 +14,8 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
-from pycore.core.logger import get_logger
 from pycore.core.exceptions import ServiceError
+from pycore.core.logger import get_bound_logger
 
 
 class SimpleState(str, Enum):
@@ -57,7 +57,7 @@ class BaseService(BaseModel, ABC):
     def __init__(self, **data):
         super().__init__(**data)
         self._state = SimpleState.IDLE
-        self._logger = get_logger().bind(service=self.name)
+        self._logger = get_bound_logger("service", self.name)
 
     @property
     def state(self) -> SimpleState:
@@ -12,7 +12,7 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
-from pycore.core.logger import get_logger
+from pycore.core.logger import get_bound_logger
 
 
 class SimpleService(BaseModel, ABC):
@@ -50,7 +50,7 @@ class SimpleService(BaseModel, ABC):
 
     def __init__(self, **data):
         super().__init__(**data)
-        self._logger = get_logger().bind(service=self.name)
+        self._logger = get_bound_logger("service", self.name)
 
     @property
     def logger(self):
@@ -5,22 +5,93 @@
 
 from __future__ import annotations
 
-from enum import Enum
-from typing import Callable, Optional
+import threading
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from pycore.core.exceptions import ServiceStateError
 
 
-class ServiceState(str, Enum):
-    """服务执行状态。"""
+class ServiceState(IntEnum):
+    """
+    服务执行状态。
+
+    成员为连续整数，可直接用作转换表的下标；
+    小写字符串标签（如 "idle"）通过 label 获取。
+    """
+
+    IDLE = 0
+    STARTING = 1
+    RUNNING = 2
+    PAUSED = 3
+    STOPPING = 4
+    STOPPED = 5
+    ERROR = 6
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}.{self._name_}"
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    @property
+    def label(self) -> str:
+        """小写字符串标签（旧版 str 枚举的取值），用于日志和序列化。"""
+        return _STATE_LABELS[self]
+
+    @classmethod
+    def _missing_(cls, value: Any) -> Optional["ServiceState"]:
+        """支持按字符串标签查找，如 ServiceState("running")。"""
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+
 
-    IDLE = "idle"
-    STARTING = "starting"
-    RUNNING = "running"
-    PAUSED = "paused"
-    STOPPING = "stopping"
-    STOPPED = "stopped"
-    ERROR = "error"
+# 状态数量
+_NUM_STATES = len(ServiceState)
+
+# 按整数值排列的成员。IntEnum 成员本身就是 int，可直接作为下标和移位量使用，
+# 无需额外的序号属性；需要由整数取回成员时用此元组而非迭代枚举类
+_STATES: tuple[ServiceState, ...] = tuple(ServiceState)
+
+# 按状态整数值索引的小写标签
+_STATE_LABELS: tuple[str, ...] = tuple(s.name.lower() for s in _STATES)
+
+# 按状态整数值索引的 str() 形式（如 "ServiceState.RUNNING"）与 StateMachine repr
+_STATE_STRS: tuple[str, ...] = tuple(str(s) for s in _STATES)
+_STATE_REPRS: tuple[str, ...] = tuple(f"StateMachine(state={s})" for s in _STATE_STRS)
+
+
+def _build_masks(
+    transitions: Mapping[ServiceState, Iterable[ServiceState]],
+) -> tuple[int, ...]:
+    """将转换映射展开为位掩码表：masks[from] 的第 to 位为 1 表示允许。"""
+    masks = [0] * _NUM_STATES
+    for from_state, targets in transitions.items():
+        for to_state in targets:
+            masks[from_state] |= 1 << to_state
+    return tuple(masks)
+
+
+# 不使用默认转换时共享的空掩码表
+_EMPTY_MASKS: tuple[int, ...] = (0,) * _NUM_STATES
+
+
+@lru_cache(maxsize=None)
+def _states_in_mask(mask: int) -> frozenset[ServiceState]:
+    """位掩码对应的状态集合（按掩码缓存，最多 2**N 种）。"""
+    return frozenset(_STATES[i] for i in range(_NUM_STATES) if mask >> i & 1)
 
 
 class StateMachine:
@@ -47,20 +118,40 @@ class StateMachine:
         sm.transition(ServiceState.RUNNING)  # 打印 "Running!"
     """
 
-    # 默认状态转换映射
-    DEFAULT_TRANSITIONS: dict[ServiceState, set[ServiceState]] = {
-        ServiceState.IDLE: {ServiceState.STARTING},
-        ServiceState.STARTING: {ServiceState.RUNNING, ServiceState.ERROR},
-        ServiceState.RUNNING: {
-            ServiceState.PAUSED,
-            ServiceState.STOPPING,
-            ServiceState.ERROR,
-        },
-        ServiceState.PAUSED: {ServiceState.RUNNING, ServiceState.STOPPING},
-        ServiceState.STOPPING: {ServiceState.STOPPED, ServiceState.ERROR},
-        ServiceState.STOPPED: {ServiceState.IDLE},
-        ServiceState.ERROR: {ServiceState.STOPPING, ServiceState.IDLE},
-    }
+    __slots__ = (
+        "_state",
+        "_state_name",
+        "_mask",
+        "_on_enter_callbacks",
+        "_on_exit_callbacks",
+        "_lock",
+    )
+
+    # 默认状态转换映射（只读，所有实例共享）
+    DEFAULT_TRANSITIONS: Mapping[ServiceState, frozenset[ServiceState]]
+    DEFAULT_TRANSITIONS = MappingProxyType(
+        {
+            ServiceState.IDLE: frozenset({ServiceState.STARTING}),
+            ServiceState.STARTING: frozenset(
+                {ServiceState.RUNNING, ServiceState.ERROR}
+            ),
+            ServiceState.RUNNING: frozenset(
+                {
+                    ServiceState.PAUSED,
+                    ServiceState.STOPPING,
+                    ServiceState.ERROR,
+                }
+            ),
+            ServiceState.PAUSED: frozenset(
+                {ServiceState.RUNNING, ServiceState.STOPPING}
+            ),
+            ServiceState.STOPPING: frozenset(
+                {ServiceState.STOPPED, ServiceState.ERROR}
+            ),
+            ServiceState.STOPPED: frozenset({ServiceState.IDLE}),
+            ServiceState.ERROR: frozenset({ServiceState.STOPPING, ServiceState.IDLE}),
+        }
+    )
 
     def __init__(
         self,
@@ -68,69 +159,134 @@ class StateMachine:
         use_defaults: bool = True,
     ):
         self._state = initial
-        self._transitions: dict[ServiceState, set[ServiceState]] = {}
-        self._on_enter_callbacks: dict[ServiceState, list[Callable]] = {}
-        self._on_exit_callbacks: dict[ServiceState, list[Callable]] = {}
-
-        if use_defaults:
-            self._transitions = {k: v.copy() for k, v in self.DEFAULT_TRANSITIONS.items()}
+        self._state_name = _STATE_LABELS[initial]
+        # 保护“校验→回调→赋值”与注册操作；可重入，回调中可再次查询或转换
+        self._lock = threading.RLock()
+        # 允许的转换：_mask[from] >> to & 1 为 1 表示允许。
+        # 初始共享只读元组，首次修改转换规则时才复制为实例自有的列表（写时复制）
+        self._mask: Sequence[int] = (
+            self._default_masks() if use_defaults else _EMPTY_MASKS
+        )
+        # 按状态整数值索引的回调元组；注册很少而触发频繁，默认为空元组
+        self._on_enter_callbacks: list[tuple[Callable, ...]] = [()] * _NUM_STATES
+        self._on_exit_callbacks: list[tuple[Callable, ...]] = [()] * _NUM_STATES
+
+    def __getstate__(self) -> dict[str, Any]:
+        """支持 pickle/deepcopy：锁不可序列化，不随状态复制。"""
+        return {name: getattr(self, name) for name in self.__slots__ if name != "_lock"}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.RLock()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _default_masks(cls) -> tuple[int, ...]:
+        """按类缓存 DEFAULT_TRANSITIONS 展开后的掩码表（子类可覆盖默认转换）。"""
+        return _build_masks(cls.DEFAULT_TRANSITIONS)
+
+    def _owned_mask(self) -> MutableSequence[int]:
+        """获取可修改的掩码表，仍为共享元组时先复制。"""
+        mask = self._mask
+        if isinstance(mask, tuple):
+            mask = self._mask = list(mask)
+        return mask
 
     @property
     def state(self) -> ServiceState:
         """获取当前状态。"""
         return self._state
 
+    @property
+    def state_name(self) -> str:
+        """当前状态的小写标签（如 "running"），随转换预先更新。"""
+        return self._state_name
+
     @property
     def is_idle(self) -> bool:
-        return self._state == ServiceState.IDLE
+        return self._state is ServiceState.IDLE
 
     @property
     def is_running(self) -> bool:
-        return self._state == ServiceState.RUNNING
+        return self._state is ServiceState.RUNNING
 
     @property
     def is_error(self) -> bool:
-        return self._state == ServiceState.ERROR
+        return self._state is ServiceState.ERROR
 
     def add_transition(
         self, from_state: ServiceState, to_state: ServiceState
     ) -> "StateMachine":
         """添加允许的状态转换。"""
-        if from_state not in self._transitions:
-            self._transitions[from_state] = set()
-        self._transitions[from_state].add(to_state)
+        with self._lock:
+            self._owned_mask()[from_state] |= 1 << to_state
         return self
 
     def remove_transition(
         self, from_state: ServiceState, to_state: ServiceState
     ) -> "StateMachine":
         """移除状态转换。"""
-        if from_state in self._transitions:
-            self._transitions[from_state].discard(to_state)
+        with self._lock:
+            self._owned_mask()[from_state] &= ~(1 << to_state)
+        return self
+
+    def add_transitions(
+        self,
+        transitions: Union[
+            Mapping[ServiceState, Iterable[ServiceState]],
+            Iterable[tuple[ServiceState, ServiceState]],
+        ],
+    ) -> "StateMachine":
+        """
+        批量添加允许的状态转换。
+
+        参数：
+            transitions: (from_state, to_state) 对的可迭代对象，
+                或 {from_state: [to_state, ...]} 映射
+        """
+        if isinstance(transitions, Mapping):
+            pairs: Iterable[tuple[ServiceState, ServiceState]] = (
+                (from_state, to_state)
+                for from_state, targets in transitions.items()
+                for to_state in targets
+            )
+        else:
+            pairs = transitions
+        with self._lock:
+            mask = self._owned_mask()
+            for from_state, to_state in pairs:
+                mask[from_state] |= 1 << to_state
+        return self
+
+    def replace_transitions(
+        self, transitions: Mapping[ServiceState, Iterable[ServiceState]]
+    ) -> "StateMachine":
+        """用 {from_state: [to_state, ...]} 映射整体替换转换规则。"""
+        masks = list(_build_masks(transitions))
+        with self._lock:
+            self._mask = masks
         return self
 
     def on_enter(self, state: ServiceState, callback: Callable) -> "StateMachine":
         """注册进入状态的回调。"""
-        if state not in self._on_enter_callbacks:
-            self._on_enter_callbacks[state] = []
-        self._on_enter_callbacks[state].append(callback)
+        with self._lock:
+            self._on_enter_callbacks[state] += (callback,)
         return self
 
     def on_exit(self, state: ServiceState, callback: Callable) -> "StateMachine":
         """注册退出状态的回调。"""
-        if state not in self._on_exit_callbacks:
-            self._on_exit_callbacks[state] = []
-        self._on_exit_callbacks[state].append(callback)
+        with self._lock:
+            self._on_exit_callbacks[state] += (callback,)
         return self
 
     def can_transition(self, to_state: ServiceState) -> bool:
         """检查转换到给定状态是否允许。"""
-        allowed = self._transitions.get(self._state, set())
-        return to_state in allowed
+        return bool(self._mask[self._state] >> to_state & 1)
 
-    def get_allowed_transitions(self) -> set[ServiceState]:
-        """获取从当前状态可以转换到的所有状态。"""
-        return self._transitions.get(self._state, set()).copy()
+    def get_allowed_transitions(self) -> frozenset[ServiceState]:
+        """获取从当前状态可以转换到的所有状态（只读集合，无需复制）。"""
+        return _states_in_mask(self._mask[self._state])
 
     def transition(
         self,
@@ -151,29 +307,71 @@ class StateMachine:
         抛出：
             ServiceStateError: 如果转换不允许
         """
-        if not force and not self.can_transition(to_state):
-            raise ServiceStateError(
-                f"Cannot transition from '{self._state}' to '{to_state}'",
-                from_state=self._state.value,
-                to_state=to_state.value,
-            )
-
-        # 退出回调
-        for callback in self._on_exit_callbacks.get(self._state, []):
-            callback()
-
-        previous = self._state
-        self._state = to_state
+        with self._lock:
+            # 内联 can_transition()，省去一次方法调用
+            if not force and not self._mask[self._state] >> to_state & 1:
+                # 错误消息与详情均取自预计算的表，不经过枚举的 __format__/value
+                raise ServiceStateError(
+                    f"Cannot transition from '{_STATE_STRS[self._state]}' "
+                    f"to '{_STATE_STRS[to_state]}'",
+                    from_state=self._state_name,
+                    to_state=_STATE_LABELS[to_state],
+                )
+
+            # 退出回调（多数状态没有回调，直接跳过）
+            callbacks = self._on_exit_callbacks[self._state]
+            if callbacks:
+                for callback in callbacks:
+                    callback()
+
+            previous = self._state
+            self._state = to_state
+            self._state_name = _STATE_LABELS[to_state]
+
+            # 进入回调
+            callbacks = self._on_enter_callbacks[to_state]
+            if callbacks:
+                for callback in callbacks:
+                    callback()
+
+            return previous
+
+    def try_transition(self, to_state: ServiceState) -> bool:
+        """
+        尝试执行状态转换，不阻塞、不抛出异常。
 
-        # 进入回调
-        for callback in self._on_enter_callbacks.get(to_state, []):
-            callback()
+        仅在锁空闲时占用它完成“校验→赋值”，锁被占用或转换不允许时立即返回 False；
+        回调在锁外触发，临界区只包含状态交换。适合高频、低竞争的切换（如 RUNNING ↔ PAUSED）。
 
-        return previous
+        返回：
+            是否完成转换
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            current = self._state
+            if not self._mask[current] >> to_state & 1:
+                return False
+            self._state = to_state
+            self._state_name = _STATE_LABELS[to_state]
+        finally:
+            self._lock.release()
+
+        callbacks = self._on_exit_callbacks[current]
+        if callbacks:
+            for callback in callbacks:
+                callback()
+        callbacks = self._on_enter_callbacks[to_state]
+        if callbacks:
+            for callback in callbacks:
+                callback()
+        return True
 
     def reset(self, to_state: ServiceState = ServiceState.IDLE) -> None:
         """重置到状态而不进行验证。"""
-        self._state = to_state
+        with self._lock:
+            self._state = to_state
+            self._state_name = _STATE_LABELS[to_state]
 
     def __repr__(self) -> str:
-        return f"StateMachine(state={self._state})"
+        return _STATE_REPRS[self._state]
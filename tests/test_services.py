@@ -0,0 +1,64 @@
+"""服务的回归测试。"""
+
+import copy
+import pickle
+import unittest
+
+from pycore.core.schema import Message
+from pycore.services.agent import AgentContext, AgentService
+from pycore.services.state import ServiceState, StateMachine
+
+
+class EchoAgent(AgentService):
+    name: str = "echo"
+
+    async def step(self) -> str:
+        return "echo"
+
+
+class StateMachineCopyTest(unittest.TestCase):
+    def test_pickle_roundtrip(self):
+        sm = StateMachine()
+        sm.add_transition(ServiceState.IDLE, ServiceState.ERROR)
+        restored = pickle.loads(pickle.dumps(sm))
+        self.assertIs(restored.state, ServiceState.IDLE)
+        self.assertTrue(restored.can_transition(ServiceState.ERROR))
+        self.assertIsNot(restored._lock, sm._lock)
+
+
+class AgentServiceCopyTest(unittest.TestCase):
+    def test_deep_copy(self):
+        service = EchoAgent()
+        service.context.add_message("user", "hi")
+
+        for copied in (copy.deepcopy(service), service.model_copy(deep=True)):
+            copied._state_machine.transition(ServiceState.STARTING)
+            self.assertIs(copied.state, ServiceState.STARTING)
+            self.assertIs(service.state, ServiceState.IDLE)
+            self.assertEqual(
+                copied.context.get_messages_as_dicts(),
+                [{"role": "user", "content": "hi"}],
+            )
+
+
+class AgentContextTest(unittest.TestCase):
+    def test_duplicate_count_only_sees_window(self):
+        context = AgentContext(max_messages=3)
+        for _ in range(5):
+            context.add_message("assistant", "same")
+        self.assertEqual(context.duplicate_count, 2)
+
+    def test_direct_mutation_invalidates_caches(self):
+        context = AgentContext()
+        for _ in range(3):
+            context.add_message("assistant", "same")
+        context.messages[1] = Message(role="user", content="mid")
+        self.assertEqual(context.duplicate_count, 0)
+        self.assertEqual(
+            [d["content"] for d in context.get_messages_as_dicts()],
+            ["same", "mid", "same"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()